@@ -1,5 +1,6 @@
 # package init
 from .wrapper import load, loads, dump, dumps, load_json, json_to_ker, ker_to_json
+from .cache import load_cached as load_path
 from .errors import KerError
 
-__all__ = ["load", "loads", "dump", "dumps", "load_json", "json_to_ker", "ker_to_json", "KerError"]
+__all__ = ["load", "loads", "dump", "dumps", "load_json", "json_to_ker", "ker_to_json", "load_path", "KerError"]
@@ -0,0 +1,50 @@
+# ker/bench.py
+"""Time loads/dumps on a synthetic document: python -m ker.bench [sections]"""
+import platform
+import sys
+import time
+from .wrapper import loads, dumps
+
+
+def _sample(n):
+    return {
+        f"section_{i}": {
+            "name": f"item {i}",
+            "enabled": i % 2 == 0,
+            "port": 1000 + i,
+            "ratio": i / 7,
+            "tags": ["a", "b", "c"],
+            "nested": {"x": None, "y": [1, 2, 3, 4, 5, 6]},
+        }
+        for i in range(n)
+    }
+
+
+def _best(fn, runs=5):
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    n = int(argv[0]) if argv else 5000
+    data = _sample(n)
+    text = dumps(data)
+
+    impl = platform.python_implementation()
+    print(f"{impl} {platform.python_version()}, {len(text) / 1e6:.2f} MB document")
+    if impl == "PyPy":
+        # the JIT needs a few runs to warm up before timings settle
+        _best(lambda: loads(text), runs=3)
+        print("note: PyPy timings are taken after a warm-up round")
+    print(f"loads  {_best(lambda: loads(text)):.3f}s")
+    print(f"dumps  {_best(lambda: dumps(data)):.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# ker/cache.py
+import hashlib
+import io
+import marshal
+import os
+import sys
+from .wrapper import load
+
+
+def _default_cache_dir():
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "ker")
+
+
+def _cache_file(path, cache_dir):
+    # one entry per source file, overwritten in place when the file changes;
+    # marshal's format is tied to the interpreter, so that's part of the key
+    key = f"{os.path.abspath(path)}\0{sys.implementation.cache_tag}"
+    return os.path.join(cache_dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".marshal")
+
+
+def load_cached(path, cache_dir=None):
+    """Like load(path), but reuse the result of an earlier parse of the same
+    file from an on-disk cache while its contents are unchanged.
+
+    The cache lives in cache_dir, by default $XDG_CACHE_HOME/ker or
+    ~/.cache/ker. Every call returns a fresh object, so callers may mutate
+    it freely.
+    """
+    if cache_dir is None:
+        cache_dir = _default_cache_dir()
+    with open(path, "rb") as f:
+        raw = f.read()
+    # Entries are checked against a hash of the contents rather than
+    # mtime/size, which miss same-size rewrites within the filesystem's
+    # timestamp resolution. Hashing is far cheaper than parsing.
+    digest = hashlib.blake2b(raw, digest_size=16).digest()
+    cache_file = _cache_file(path, cache_dir)
+    try:
+        with open(cache_file, "rb") as f:
+            # the digest is stored first, so a stale entry is rejected
+            # without reading the document
+            if marshal.load(f) == digest:
+                return marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    # parse the bytes that were hashed, decoded the way load() decodes files
+    data = load(io.TextIOWrapper(io.BytesIO(raw), encoding="utf-8"))
+    # write under a private name first so readers never see half a file
+    tmp = f"{cache_file}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(tmp, "wb") as f:
+            marshal.dump(digest, f)
+            marshal.dump(data, f)
+        os.replace(tmp, cache_file)
+    except (OSError, ValueError):
+        # the cache is only an optimisation: a read-only home or data marshal
+        # can't store (e.g. nested too deeply) just means no entry
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+    return data
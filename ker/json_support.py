@@ -1,125 +1,202 @@
 # ker/json_support.py
+import io
 import json
 import re
 from typing import Optional
 from .parser import Node
 
-def lit_repr(val):
+# characters json.dumps would escape when ensure_ascii=False
+_NEED_ESCAPE = re.compile(r'[\x00-\x1f"\\]').search
+# printable ASCII minus '"' and '\\': what json.dumps leaves alone by default
+_PLAIN_ASCII = re.compile(r'[ !#-\[\]-~]*\Z').match
+
+def _quote(s):
+    # same result as json.dumps(s, ensure_ascii=False), minus the encoder
+    # setup for the common case of nothing to escape
+    if _NEED_ESCAPE(s) is None:
+        return '"' + s + '"'
+    return json.dumps(s, ensure_ascii=False)
+
+def _lit_repr_slow(val):
     if isinstance(val, str):
-        return json.dumps(val, ensure_ascii=False)
+        return _quote(val)
     if isinstance(val, bool):
         return "true" if val else "false"
     if val is None:
         return "null"
     return str(val)
 
+# exact-type fast paths; subclasses fall back to the isinstance chain above
+_REPR = {
+    str: _quote,
+    bool: lambda v: "true" if v else "false",
+    type(None): lambda v: "null",
+    int: str,
+    float: str,
+}
+
+def lit_repr(val):
+    f = _REPR.get(type(val))
+    return f(val) if f else _lit_repr_slow(val)
+
 def identifier_repr(k):
-    return k if re.match(r'^[A-Za-z_][A-Za-z0-9_]*$', k) else json.dumps(k)
+    # an ASCII identifier is exactly [A-Za-z_][A-Za-z0-9_]*
+    if k.isascii() and k.isidentifier():
+        return k
+    # keys are quoted with ensure_ascii, so only plain ASCII skips json.dumps
+    if _PLAIN_ASCII(k):
+        return '"' + k + '"'
+    return json.dumps(k)
 
-def dumps_to_ker(root_node: Node, indent_str: str = "    ") -> str:
+def _parts(node):
+    """Split a Node or a plain Python value into
+    (comments, children, elements, value, inline comment)."""
+    if isinstance(node, Node):
+        return node.comments_before, node.children, node.elements, node.value, node.comment_inline
+    if isinstance(node, dict):
+        return (), node, None, None, None
+    if isinstance(node, list):
+        return (), None, node, None, None
+    return (), None, None, node, None
+
+def dumps_to_ker(root_node, indent_str: str = "    ") -> str:
     """
-    Pretty-print a Node tree to .ker format.
+    Pretty-print a Node tree, or plain dict/list/literal data, to .ker format.
 
     indent_str: string used for one indentation level (default 4 spaces).
     """
-    def node_lines(node: Node, key: Optional[str], level: int):
-        ind = indent_str * level
-        out = []
+    buf = io.StringIO()
+    write_ker(root_node, buf.write, indent_str)
+    return buf.getvalue()
+
+
+def write_ker(root_node, write, indent_str: str = "    "):
+    """
+    Stream a Node tree or plain data as .ker text through `write` (e.g. fp.write).
+
+    Produces exactly the text dumps_to_ker returns, one line per call.
+    """
+    _lit_repr = lit_repr
+    _ident_repr = identifier_repr
+    _indent = indent_str
+
+    sep = ""
+
+    def out(line):
+        # lines are "\n"-separated, with no newline after the last one
+        nonlocal sep
+        write(sep + line)
+        sep = "\n"
+
+    def emit(node, key: Optional[str], level: int):
+        ind = _indent * level
+        comments, children, elements, value, inline = _parts(node)
 
         # comments before this node
-        for c in getattr(node, "comments_before", []):
-            out.append(ind + "# " + c)
+        for c in comments:
+            out(ind + "# " + c)
 
         # Object block
-        if getattr(node, "children", None) is not None:
+        if children is not None:
             if key is None:
-                out.append(ind + "{")
+                out(ind + "{")
             else:
-                out.append(ind + f"{identifier_repr(key)} {{")
-            for k, child in node.children.items():
-                out.extend(node_lines(child, k, level + 1))
-            out.append(ind + "}")
-            return out
+                out(ind + f"{_ident_repr(key)} {{")
+            for k, child in children.items():
+                emit(child, k, level + 1)
+            out(ind + "}")
+            return
 
         # Array
-        if getattr(node, "elements", None) is not None:
-            simple = all((getattr(e, "value", None) is not None) and not getattr(e, "children", None) and not getattr(e, "elements", None) for e in node.elements)
+        if elements is not None:
+            parts = [_parts(e) for e in elements]
+            # simple = only non-null literals; only short arrays can be inlined,
+            # so long ones skip the scan
+            simple = len(parts) <= 5 and all(p[3] is not None and not p[1] and not p[2] for p in parts)
             if key is None:
-                if simple and len(node.elements) <= 5:
-                    line = "[{}]".format(", ".join(lit_repr(e.value) for e in node.elements))
-                    out.append(ind + line)
-                    return out
-                out.append(ind + "[")
+                if simple:
+                    line = "[{}]".format(", ".join(_lit_repr(p[3]) for p in parts))
+                    out(ind + line)
+                    return
+                out(ind + "[")
             else:
-                if simple and len(node.elements) <= 5:
-                    line = f"{identifier_repr(key)} = [{', '.join(lit_repr(e.value) for e in node.elements)}]"
-                    out.append(ind + line)
-                    return out
-                out.append(ind + f"{identifier_repr(key)} = [")
-
-            for elem in node.elements:
-                for c in getattr(elem, "comments_before", []):
-                    out.append(ind + indent_str + "# " + c)
-                if getattr(elem, "children", None) is not None or getattr(elem, "elements", None) is not None:
-                    out.extend(node_lines(elem, key=None, level=level + 1))
+                if simple:
+                    line = f"{_ident_repr(key)} = [{', '.join(_lit_repr(p[3]) for p in parts)}]"
+                    out(ind + line)
+                    return
+                out(ind + f"{_ident_repr(key)} = [")
+
+            inner = ind + _indent
+            for elem, (e_comments, e_children, e_elements, e_value, e_inline) in zip(elements, parts):
+                for c in e_comments:
+                    out(inner + "# " + c)
+                if e_children is not None or e_elements is not None:
+                    emit(elem, None, level + 1)
                 else:
-                    v = lit_repr(elem.value)
-                    line = ind + indent_str + v
-                    if getattr(elem, "comment_inline", None):
-                        line += "  # " + elem.comment_inline
-                    out.append(line)
-            out.append(ind + "]")
-            return out
+                    line = inner + _lit_repr(e_value)
+                    if e_inline:
+                        line += "  # " + e_inline
+                    out(line)
+            out(ind + "]")
+            return
 
         # Literal
-        val_repr = lit_repr(getattr(node, "value", None))
+        val_repr = _lit_repr(value)
         if key is None:
             line = ind + val_repr
         else:
-            line = ind + f"{identifier_repr(key)} = {val_repr}"
-        if getattr(node, "comment_inline", None):
-            line += "  # " + node.comment_inline
-        out.append(line)
-        return out
+            line = ind + f"{_ident_repr(key)} = {val_repr}"
+        if inline:
+            line += "  # " + inline
+        out(line)
 
-    lines = []
-    if getattr(root_node, "children", None):
-        for k, child in root_node.children.items():
-            lines.extend(node_lines(child, k, 0))
-    return "\n".join(lines)
+    root_children = _parts(root_node)[1]
+    if root_children:
+        for k, child in root_children.items():
+            emit(child, k, 0)
 
 
 def node_to_json(node: Node):
     """Convert AST Node -> plain Python structures (dict/list/literals)."""
-    if getattr(node, "children", None) is not None:
+    if node.children is not None:
         return {k: node_to_json(v) for k, v in node.children.items()}
-    if getattr(node, "elements", None) is not None:
+    if node.elements is not None:
         return [node_to_json(e) for e in node.elements]
-    return getattr(node, "value", None)
+    return node.value
 
-def py_to_node(val, key=None):
-    """Convert plain Python value -> Node tree (for dumping)."""
-    # Create a Node instance without assuming constructor signature
-    n = Node()  # construct empty, then set attributes
-    # set common attrs
+def _new_node(val, key):
+    n = Node()
     n.key = key
-    n.value = None
-    n.src_pos = None
+    # these trees are built to be annotated, so give each its own list
     n.comments_before = []
-    n.comment_inline = None
-    n.children = None
-    n.elements = None
-
     if isinstance(val, dict):
         n.children = {}
-        for k, v in val.items():
-            child = py_to_node(v, key=k)
-            n.children[k] = child
     elif isinstance(val, list):
         n.elements = []
-        for v in val:
-            n.elements.append(py_to_node(v))
     else:
         n.value = val
-
     return n
+
+def py_to_node(val, key=None):
+    """Convert plain Python value -> Node tree.
+
+    dumps() serializes plain data directly; this is for callers that want
+    a Node tree, e.g. to attach comments before formatting.
+    """
+    root = _new_node(val, key)
+    # (node, raw container) pairs whose contents still need converting
+    todo = [(root, val)]
+    while todo:
+        n, raw = todo.pop()
+        if n.children is not None:
+            for k, v in raw.items():
+                child = n.children[k] = _new_node(v, k)
+                if child.children is not None or child.elements is not None:
+                    todo.append((child, v))
+        elif n.elements is not None:
+            for v in raw:
+                child = _new_node(v, None)
+                n.elements.append(child)
+                if child.children is not None or child.elements is not None:
+                    todo.append((child, v))
+    return root
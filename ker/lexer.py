@@ -1,5 +1,8 @@
 # ker/lexer.py
 import re
+import sys
+from json.decoder import scanstring as _scanstring
+from array import array
 from .errors import LexerError
 
 class Token:
@@ -7,6 +10,8 @@ class Token:
     EQUALS, LBRACE, RBRACE, LBRACKET, RBRACKET, \
     COMMA, COLON, COMMENT, EOF = range(15)
 
+    __slots__ = ('type', 'value', 'line', 'col')
+
     def __init__(self, type_, value, line, col):
         self.type = type_
         self.value = value
@@ -17,107 +22,170 @@ class Token:
         return f"Token({self.type}, {self.value}, {self.line}:{self.col})"
 
 
+# One alternation for the whole token grammar; the regex engine does the
+# character scanning and we only touch Python once per token. Leading
+# blanks and newlines are consumed by the same match, so they never cost
+# a loop turn; line numbers are worked out from offsets only when needed.
+_MASTER = re.compile(r'''
+    [ \t\r\n]*
+    (?:
+        (?P<STRING>"(?:\\[\s\S]|[^"\\])*")
+      | (?P<NUMBER>-?\d+(?:\.\d*)?(?:[eE][+-]?\d+)?)
+      | (?P<IDENT>[^\W\d]\w*)
+      | (?P<COMMENT>\#[^\n]*)
+      | (?P<PUNCT>[={}\[\],:])
+      | (?P<MISMATCH>.)
+      | (?P<END>\Z)
+    )
+''', re.VERBOSE)
+
+# a \u surrogate pair comes first so both halves are seen together
+_ESCAPE = re.compile(r'\\(u[dD][89abAB][0-9a-fA-F]{2}\\u[dD][c-fC-F][0-9a-fA-F]{2}|u[0-9a-fA-F]{4}|[\s\S])')
+
+_SIMPLE_ESC = {'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+
+def _unescape_one(m):
+    e = m.group(1)
+    if len(e) == 11:
+        # join a high/low surrogate pair the way json's scanstring does
+        hi = int(e[1:5], 16)
+        lo = int(e[7:], 16)
+        return chr(0x10000 + ((hi - 0xd800) << 10 | (lo - 0xdc00)))
+    if len(e) == 5:
+        return chr(int(e[1:], 16))
+    # anything JSON doesn't define keeps its old meaning: \x -> x
+    return _SIMPLE_ESC.get(e, e)
+
+
+def _unescape(body):
+    """Decode the escapes in a string literal's body (quotes stripped)."""
+    try:
+        # the common case: only JSON escapes, decoded in C
+        return _scanstring(body + '"', 0, False)[0]
+    except ValueError:
+        return _ESCAPE.sub(_unescape_one, body)
+
+_intern = sys.intern
+
+_KEYWORDS = {"true": Token.TRUE, "false": Token.FALSE, "null": Token.NULL}
+
+_PUNCT = {
+    '=': Token.EQUALS,
+    '{': Token.LBRACE,
+    '}': Token.RBRACE,
+    '[': Token.LBRACKET,
+    ']': Token.RBRACKET,
+    ',': Token.COMMA,
+    ':': Token.COLON,
+}
+
+
 class Lexer:
     def __init__(self, text: str):
         self.text = text
-        self.pos = 0
-        self.line = 1
-        self.col = 1
-        self.current_char = text[0] if text else None
-
-    def advance(self):
-        if self.current_char == '\n':
-            self.line += 1
-            self.col = 1
-        else:
-            self.col += 1
-        self.pos += 1
-        self.current_char = self.text[self.pos] if self.pos < len(self.text) else None
-
-    def peek(self):
-        nxt = self.pos + 1
-        return self.text[nxt] if nxt < len(self.text) else None
-
-    def skip_whitespace(self):
-        while self.current_char and self.current_char in ' \t\r':
-            self.advance()
-
-    def lex_string(self):
-        start_line, start_col = self.line, self.col
-        self.advance()  # skip opening "
-        s = []
-        while self.current_char and self.current_char != '"':
-            if self.current_char == '\\':
-                self.advance()
-                if not self.current_char:
-                    break
-            s.append(self.current_char)
-            self.advance()
-        if self.current_char != '"':
-            raise LexerError(f"Unterminated string at {start_line}:{start_col}")
-        self.advance()
-        return Token(Token.STRING, ''.join(s), start_line, start_col)
-
-    def lex_number(self):
-        start_line, start_col = self.line, self.col
-        num = ''
-        if self.current_char == '-':
-            num += '-'
-            self.advance()
-        while self.current_char and (self.current_char.isdigit() or self.current_char == '.'):
-            num += self.current_char
-            self.advance()
-        return Token(Token.NUMBER, num, start_line, start_col)
-
-    def lex_ident_or_keyword(self):
-        start_line, start_col = self.line, self.col
-        s = ''
-        while self.current_char and (self.current_char.isalnum() or self.current_char == '_'):
-            s += self.current_char
-            self.advance()
-        kw = s.lower()
-        if kw == "true":
-            return Token(Token.TRUE, s, start_line, start_col)
-        if kw == "false":
-            return Token(Token.FALSE, s, start_line, start_col)
-        if kw == "null":
-            return Token(Token.NULL, s, start_line, start_col)
-        return Token(Token.IDENT, s, start_line, start_col)
+        self._tokens = None
+        self._next = 0
+
+    def _line_col(self, offset):
+        text = self.text
+        return text.count('\n', 0, offset) + 1, offset - text.rfind('\n', 0, offset)
+
+    def scan(self):
+        """Lex the whole input into parallel buffers (types, offsets, values).
+
+        Entry i of each describes token i; the last token is EOF. Offsets
+        index into self.text; positions() turns them into lines and columns.
+        """
+        text = self.text
+        types = array('i')
+        offsets = array('l')
+        values = []
+        add_type = types.append
+        add_offset = offsets.append
+        add_value = values.append
+        for m in _MASTER.finditer(text):
+            kind = m.lastgroup
+            s = m.group(kind)
+            if kind == 'IDENT':
+                add_type(_KEYWORDS.get(s.lower(), Token.IDENT))
+                # keys repeat a lot; interning lets every dict share one copy
+                add_value(_intern(s))
+            elif kind == 'PUNCT':
+                add_type(_PUNCT[s])
+                add_value(s)
+            elif kind == 'NUMBER':
+                add_type(Token.NUMBER)
+                if '.' in s or 'e' in s or 'E' in s:
+                    add_value(float(s))
+                else:
+                    add_value(int(s))
+            elif kind == 'STRING':
+                add_type(Token.STRING)
+                body = s[1:-1]
+                if '\\' in body:
+                    body = _unescape(body)
+                add_value(body)
+            elif kind == 'COMMENT':
+                add_type(Token.COMMENT)
+                add_value(s[1:].strip())
+            elif kind == 'END':
+                break
+            else:
+                line, col = self._line_col(m.start(kind))
+                if s == '"':
+                    raise LexerError(f"Unterminated string at {line}:{col}")
+                raise LexerError(f"Unexpected char '{s}' at {line}:{col}")
+            add_offset(m.start(kind))
+        add_type(Token.EOF)
+        add_value(None)
+        add_offset(len(text))
+        return types, offsets, values
+
+    def positions(self, offsets):
+        """Line and column (1-based) of each offset, as two array('i').
+
+        offsets must be ascending, as scan() returns them.
+        """
+        text = self.text
+        count = text.count
+        lines = array('i')
+        cols = array('i')
+        add_line = lines.append
+        add_col = cols.append
+        line = 1
+        line_start = 0
+        prev = 0
+        for off in offsets:
+            nl = count('\n', prev, off)
+            if nl:
+                line += nl
+                line_start = text.rfind('\n', prev, off) + 1
+            add_line(line)
+            add_col(off - line_start + 1)
+            prev = off
+        return lines, cols
+
+    def tokenize(self):
+        """Lex the whole input into a list of Tokens that always ends with EOF."""
+        types, lines, cols, values = self.tokenize_soa()
+        return list(map(Token, types, values, lines, cols))
+
+    def tokenize_soa(self):
+        """Lex the whole input into parallel buffers (types, lines, cols, values).
+
+        types, lines and cols are array('i'); values is a list. Entry i of
+        each describes token i, and the last token is always EOF.
+        """
+        types, offsets, values = self.scan()
+        lines, cols = self.positions(offsets)
+        return types, lines, cols, values
 
     def get_next_token(self):
-        while self.current_char is not None:
-            if self.current_char in ' \t\r':
-                self.skip_whitespace()
-                continue
-            if self.current_char == '\n':
-                self.advance()
-                continue
-            if self.current_char == '#':
-                start_line, start_col = self.line, self.col
-                self.advance()
-                c = ''
-                while self.current_char and self.current_char != '\n':
-                    c += self.current_char
-                    self.advance()
-                return Token(Token.COMMENT, c.strip(), start_line, start_col)
-            if self.current_char.isalpha() or self.current_char == '_':
-                return self.lex_ident_or_keyword()
-            if self.current_char.isdigit() or (self.current_char == '-' and self.peek() and self.peek().isdigit()):
-                return self.lex_number()
-            if self.current_char == '"':
-                return self.lex_string()
-            mapping = {
-                '=': Token.EQUALS,
-                '{': Token.LBRACE,
-                '}': Token.RBRACE,
-                '[': Token.LBRACKET,
-                ']': Token.RBRACKET,
-                ',': Token.COMMA,
-                ':': Token.COLON,
-            }
-            if self.current_char in mapping:
-                tok = Token(mapping[self.current_char], self.current_char, self.line, self.col)
-                self.advance()
-                return tok
-            raise LexerError(f"Unexpected char '{self.current_char}' at {self.line}:{self.col}")
-        return Token(Token.EOF, None, self.line, self.col)
+        if self._tokens is None:
+            self._tokens = self.tokenize()
+        tok = self._tokens[self._next]
+        # past the end: keep handing back the EOF token
+        if self._next < len(self._tokens) - 1:
+            self._next += 1
+        return tok
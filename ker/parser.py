@@ -1,112 +1,325 @@
 # ker/parser.py
-import re
 from .lexer import Lexer, Token
 from .errors import ParserError
 
 class Node:
+    __slots__ = ('key', 'value', 'children', 'elements', 'comments_before', 'comment_inline', 'src_pos')
+
     def __init__(self, value=None, src_pos=None):
+        self.key = None
         self.value = value
         self.children = None
         self.elements = None
-        self.comments_before = []
+        self.comments_before = ()
         self.comment_inline = None
         self.src_pos = src_pos
 
 
+# token types that open a nested block or array
+_OPENERS = frozenset({Token.LBRACE, Token.LBRACKET})
+
+# literal token types that carry a fixed Python value
+_CONSTANTS = {Token.TRUE: True, Token.FALSE: False, Token.NULL: None}
+
+
+def _returning(leaf):
+    """A literal builder that always hands back `leaf`."""
+    return lambda parser, i: leaf
+
+
+def _adders(node):
+    """Return (children dict, elements.append) for `node`; one of them is None."""
+    elements = node.elements
+    return node.children, (elements.append if elements is not None else None)
+
+
 class Parser:
     def __init__(self, text: str):
         self.lexer = Lexer(text)
-        self.current = self.lexer.get_next_token()
+        # token stream as parallel buffers; entry i of each describes token i
+        self.types, self.offsets, self.values = self.lexer.scan()
+        # line/col buffers, built by _positions() only when something needs them
+        self.lines = self.cols = None
+        self.pos = 0
         self.pending_comments = []
 
+    @property
+    def current(self):
+        """The token under the cursor as a Token (used for error messages)."""
+        self._positions()
+        i = self.pos
+        return Token(self.types[i], self.values[i], self.lines[i], self.cols[i])
+
+    def _positions(self):
+        if self.lines is None:
+            self.lines, self.cols = self.lexer.positions(self.offsets)
+
     def advance(self):
-        self.current = self.lexer.get_next_token()
+        self.pos += 1
+
+    def parse(self, share_literals=False):
+        """Parse the document into a Node tree.
+
+        share_literals: within this tree, reuse one Node for every true,
+        one for every false and one for every null leaf that has no
+        comments, instead of allocating one per leaf. The shared leaves
+        have no src_pos, and changing one changes every place it appears
+        in the tree (other trees are not affected).
+        """
+        # every Node records its source position
+        self._positions()
+        # hot loop: token constants, buffers and the cursor live in locals
+        IDENT, EQUALS, LBRACE, RBRACE = Token.IDENT, Token.EQUALS, Token.LBRACE, Token.RBRACE
+        RBRACKET, COMMA, COMMENT, EOF = Token.RBRACKET, Token.COMMA, Token.COMMENT, Token.EOF
+        openers = _OPENERS
+        dispatch = self._VALUE_DISPATCH
+        shared = ()
+        if share_literals:
+            # made per call, so no two trees ever share a leaf
+            shared = (Node(True), Node(False), Node(None))
+            dispatch = list(dispatch)
+            for tok, leaf in zip((Token.TRUE, Token.FALSE, Token.NULL), shared):
+                dispatch[tok] = _returning(leaf)
+        types = self.types
+        values = self.values
+        pos = self.pos
 
-    def parse(self):
         root = Node()
         root.children = {}
-        while self.current.type != Token.EOF:
-            if self.current.type == Token.COMMENT:
-                self.pending_comments.append(self.current.value)
-                self.advance()
+        # Containers that are still open, innermost last. Each entry is the
+        # enclosing container plus the key the open one will be stored under
+        # (None when the enclosing container is an array).
+        stack = []
+        node = root
+        # handles on the current container, refreshed whenever `node` changes
+        children, append = root.children, None
+        while True:
+            t = types[pos]
+
+            # Inside an array: one value, then an optional comma
+            if append is not None:
+                if t == RBRACKET:
+                    node, pos = self._close(node, stack, pos + 1)
+                    children, append = _adders(node)
+                elif t in openers:
+                    child = self._open(pos)
+                    pos += 1
+                    append(child)
+                    stack.append((node, None))
+                    node = child
+                    children, append = _adders(node)
+                else:
+                    handler = dispatch[t]
+                    if handler is None:
+                        self.pos = pos
+                        raise ParserError(f"Unexpected token {self.current}")
+                    append(handler(self, pos))
+                    pos += 1
+                    if types[pos] == COMMA:
+                        pos += 1
+                continue
+
+            # Inside a block or at the top level: key = value / key { ... }
+            if t == COMMENT:
+                self.pending_comments.append(values[pos])
+                pos += 1
                 continue
-            if self.current.type != Token.IDENT:
-                raise ParserError(f"Expected identifier at {self.current.line}:{self.current.col}")
-            key = self.current.value
-            self.advance()
-            if self.current.type == Token.LBRACE:
-                node = Node(src_pos=(self.current.line, self.current.col))
-                node.children = {}
-                self.advance()
-                self.parse_block(node)
+            if stack:
+                if t == RBRACE:
+                    node, pos = self._close(node, stack, pos + 1)
+                    children, append = _adders(node)
+                    continue
+                if t != IDENT:
+                    self.pos = pos
+                    raise ParserError("Expected key in block")
             else:
-                if self.current.type != Token.EQUALS:
+                if t == EOF:
+                    self.pos = pos
+                    return root
+                if t != IDENT:
+                    self.pos = pos
+                    raise ParserError(f"Expected identifier at {self.lines[pos]}:{self.cols[pos]}")
+            key = values[pos]
+            pos += 1
+            t = types[pos]
+            if t != LBRACE:
+                if t != EQUALS:
+                    self.pos = pos
                     raise ParserError("Expected '='")
-                self.advance()
-                node = self.parse_value()
+                pos += 1
+                t = types[pos]
+            if t in openers:
+                stack.append((node, key))
+                node = self._open(pos)
+                pos += 1
+                children, append = _adders(node)
+                continue
+            handler = dispatch[t]
+            if handler is None:
+                self.pos = pos
+                raise ParserError(f"Unexpected token {self.current}")
+            child = handler(self, pos)
+            pos += 1
             if self.pending_comments:
-                node.comments_before = self.pending_comments
+                if child in shared:
+                    # a shared leaf (Nodes compare by identity); comments
+                    # need a Node of its own
+                    child = self._VALUE_DISPATCH[t](self, pos - 1)
+                child.comments_before = self.pending_comments
                 self.pending_comments = []
-            root.children[key] = node
-        return root
+            children[key] = child
+
+    def parse_to_plain(self):
+        """Parse straight to dicts, lists and literals, without building Nodes.
 
-    def parse_block(self, node):
+        Comments are dropped; use parse() when they have to survive.
+        """
+        IDENT, STRING, NUMBER, EQUALS = Token.IDENT, Token.STRING, Token.NUMBER, Token.EQUALS
+        LBRACE, RBRACE, LBRACKET, RBRACKET = Token.LBRACE, Token.RBRACE, Token.LBRACKET, Token.RBRACKET
+        COMMA, COMMENT, EOF = Token.COMMA, Token.COMMENT, Token.EOF
+        openers = _OPENERS
+        constants = _CONSTANTS
+        types = self.types
+        values = self.values
+        pos = self.pos
+
+        root = {}
+        # enclosing containers of the open one, innermost last
+        stack = []
+        cur = root
+        in_array = False
         while True:
-            if self.current.type == Token.RBRACE:
-                self.advance()
-                return
-            if self.current.type == Token.COMMENT:
-                self.pending_comments.append(self.current.value)
-                self.advance()
+            t = types[pos]
+
+            if in_array:
+                if t == RBRACKET:
+                    pos += 1
+                    cur = stack.pop()
+                    in_array = type(cur) is list
+                    if in_array and types[pos] == COMMA:
+                        pos += 1
+                elif t in openers:
+                    pos += 1
+                    child = {} if t == LBRACE else []
+                    cur.append(child)
+                    stack.append(cur)
+                    cur = child
+                    in_array = t == LBRACKET
+                else:
+                    if t == STRING or t == NUMBER:
+                        cur.append(values[pos])
+                    elif t in constants:
+                        cur.append(constants[t])
+                    else:
+                        self.pos = pos
+                        raise ParserError(f"Unexpected token {self.current}")
+                    pos += 1
+                    if types[pos] == COMMA:
+                        pos += 1
                 continue
-            if self.current.type != Token.IDENT:
-                raise ParserError("Expected key in block")
-            key = self.current.value
-            self.advance()
-            if self.current.type == Token.LBRACE:
-                child = Node(src_pos=(self.current.line, self.current.col))
-                child.children = {}
-                self.advance()
-                self.parse_block(child)
+
+            if t == COMMENT:
+                pos += 1
+                continue
+            if stack:
+                if t == RBRACE:
+                    pos += 1
+                    cur = stack.pop()
+                    in_array = type(cur) is list
+                    if in_array and types[pos] == COMMA:
+                        pos += 1
+                    continue
+                if t != IDENT:
+                    self.pos = pos
+                    raise ParserError("Expected key in block")
             else:
-                if self.current.type != Token.EQUALS:
+                if t == EOF:
+                    self.pos = pos
+                    return root
+                if t != IDENT:
+                    self.pos = pos
+                    self._positions()
+                    raise ParserError(f"Expected identifier at {self.lines[pos]}:{self.cols[pos]}")
+            key = values[pos]
+            pos += 1
+            t = types[pos]
+            if t != LBRACE:
+                if t != EQUALS:
+                    self.pos = pos
                     raise ParserError("Expected '='")
-                self.advance()
-                child = self.parse_value()
-            if self.pending_comments:
-                child.comments_before = self.pending_comments
-                self.pending_comments = []
-            node.children[key] = child
+                pos += 1
+                t = types[pos]
+            if t in openers:
+                pos += 1
+                child = {} if t == LBRACE else []
+                cur[key] = child
+                stack.append(cur)
+                cur = child
+                in_array = t == LBRACKET
+                continue
+            if t == STRING or t == NUMBER:
+                cur[key] = values[pos]
+            elif t in constants:
+                cur[key] = constants[t]
+            else:
+                self.pos = pos
+                raise ParserError(f"Unexpected token {self.current}")
+            pos += 1
 
-    def parse_value(self):
-        tok = self.current
-        if tok.type == Token.STRING:
-            self.advance()
-            return Node(tok.value, (tok.line, tok.col))
-        if tok.type == Token.NUMBER:
-            self.advance()
-            v = int(tok.value) if re.fullmatch(r'-?\d+', tok.value) else float(tok.value)
-            return Node(v, (tok.line, tok.col))
-        if tok.type in (Token.TRUE, Token.FALSE):
-            self.advance()
-            return Node(tok.value.lower() == "true", (tok.line, tok.col))
-        if tok.type == Token.NULL:
-            self.advance()
-            return Node(None, (tok.line, tok.col))
-        if tok.type == Token.LBRACKET:
-            self.advance()
-            node = Node(src_pos=(tok.line, tok.col))
-            node.elements = []
-            while self.current.type != Token.RBRACKET:
-                node.elements.append(self.parse_value())
-                if self.current.type == Token.COMMA:
-                    self.advance()
-            self.advance()
-            return node
-        if tok.type == Token.LBRACE:
-            self.advance()
-            node = Node(src_pos=(tok.line, tok.col))
+    def _open(self, i):
+        """Make the block or array node for the '{' / '[' at token i."""
+        node = Node(src_pos=(self.lines[i], self.cols[i]))
+        if self.types[i] == Token.LBRACE:
             node.children = {}
-            self.parse_block(node)
-            return node
-        raise ParserError(f"Unexpected token {tok}")
+        else:
+            node.elements = []
+        return node
+
+    def _close(self, node, stack, pos):
+        """Hand the finished `node` to its parent, with the cursor just past
+        the closing bracket. Returns the parent and the new cursor."""
+        parent, key = stack.pop()
+        if parent.elements is not None:
+            if self.types[pos] == Token.COMMA:
+                pos += 1
+        else:
+            self._take_comments(node)
+            parent.children[key] = node
+        return parent, pos
+
+    def _take_comments(self, node):
+        if self.pending_comments:
+            node.comments_before = self.pending_comments
+            self.pending_comments = []
+
+    def parse_value(self):
+        """Parse a literal value (containers are handled by parse)."""
+        self._positions()
+        handler = self._VALUE_DISPATCH[self.types[self.pos]]
+        if handler is None:
+            raise ParserError(f"Unexpected token {self.current}")
+        node = handler(self, self.pos)
+        self.pos += 1
+        return node
+
+    # literal builders: each makes the Node for the token at index i
+
+    def _v_literal(self, i):
+        return Node(self.values[i], (self.lines[i], self.cols[i]))
+
+    def _v_true(self, i):
+        return Node(True, (self.lines[i], self.cols[i]))
+
+    def _v_false(self, i):
+        return Node(False, (self.lines[i], self.cols[i]))
+
+    def _v_null(self, i):
+        return Node(None, (self.lines[i], self.cols[i]))
+
+    # indexed by token type; None for tokens that can't start a literal
+    _VALUE_DISPATCH = [None] * (Token.EOF + 1)
+    _VALUE_DISPATCH[Token.STRING] = _v_literal
+    _VALUE_DISPATCH[Token.NUMBER] = _v_literal
+    _VALUE_DISPATCH[Token.TRUE] = _v_true
+    _VALUE_DISPATCH[Token.FALSE] = _v_false
+    _VALUE_DISPATCH[Token.NULL] = _v_null
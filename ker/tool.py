@@ -1,17 +1,17 @@
 import argparse
 import sys
-from .wrapper import load, loads, dump, dumps, json_to_ker, ker_to_json
+import json
+from .wrapper import load, loads, dump, dumps, json_to_ker
 
 __name__ = "ker"
 __version__ = "1.0.0"
 __author__ = "KeiraOMG0"
 __goal__ = "Format and convert .ker config files with JSON interop"
 
-def read_file_or_stdin(path: str):
+def load_file_or_stdin(path: str):
     if path == '-':
-        return sys.stdin.read()
-    with open(path, 'r', encoding='utf-8') as f:
-        return f.read()
+        return loads(sys.stdin.read())
+    return load(path)
 
 def write_stdout_or_file(path: str, text: str):
     if path == '-':
@@ -72,15 +72,13 @@ def main(argv=None):
 
     try:
         if args.cmd == 'fmt':
-            text = read_file_or_stdin(args.input)
-            out = dumps(loads(text))
+            out = dumps(load_file_or_stdin(args.input))
             write_stdout_or_file(args.output, out)
         elif args.cmd == 'to-json':
-            text = read_file_or_stdin(args.input)
-            ker_to_json(args.input, args.output, indent=args.indent)
+            out = json.dumps(load_file_or_stdin(args.input), indent=args.indent, ensure_ascii=False)
+            write_stdout_or_file(args.output, out)
         elif args.cmd == 'from-json':
             if args.input == '-':
-                import json
                 data = json.loads(sys.stdin.read())
                 out = dumps(data)
                 write_stdout_or_file(args.output, out)
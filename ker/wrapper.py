@@ -1,5 +1,5 @@
-from .parser import Parser, Node as ParserNode
-from .json_support import node_to_json, py_to_node, dumps_to_ker
+from .parser import Parser
+from .json_support import dumps_to_ker, write_ker
 from .errors import KerError
 from typing import Any
 import json
@@ -9,62 +9,57 @@ import os
 def loads(text: str) -> Any:
     """Parse ker text and return plain Python data (dict/list/literals)."""
     try:
-        p = Parser(text)
-        root = p.parse()
-        return node_to_json(root)
+        return Parser(text).parse_to_plain()
     except Exception as e:
         raise KerError(str(e)) from e
 
 
+def _read_text(path) -> str:
+    """Same result as open(path, encoding='utf-8').read(), but decoded in one
+    call instead of through the incremental text-mode decoder."""
+    with open(path, 'rb') as f:
+        text = f.read().decode('utf-8')
+    # text mode would have translated newlines for us
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
 def load(path_or_fp) -> Any:
     if hasattr(path_or_fp, 'read'):
         return loads(path_or_fp.read())
-    with open(path_or_fp, 'r', encoding='utf-8') as f:
-        return loads(f.read())
+    return loads(_read_text(path_or_fp))
 
 
 def dumps(obj, indent_str="    ") -> str:
-    # Build a root Node and serialize using dumps_to_ker
-    # new — use real Node so json_support functions see a consistent object
-    root = ParserNode()  
-    root.key = None
-    root.value = None
-    root.src_pos = None
-    root.comments_before = []
-    root.comment_inline = None
-    root.children = {}
-    root.elements = None
-
-    for k, v in obj.items():
-        root.children[k] = py_to_node(v, key=k)
-
-    return dumps_to_ker(root, indent_str=indent_str)
+    if not isinstance(obj, dict):
+        raise TypeError(f"top-level object must be a dict, not {type(obj).__name__}")
+    return dumps_to_ker(obj, indent_str=indent_str)
 
 
 def dump(obj, path_or_fp, indent_str="    "):
-    text = dumps(obj, indent_str=indent_str)
+    if not isinstance(obj, dict):
+        raise TypeError(f"top-level object must be a dict, not {type(obj).__name__}")
+    # stream straight into the target instead of building the whole string
     if hasattr(path_or_fp, 'write'):
-        path_or_fp.write(text)
+        write_ker(obj, path_or_fp.write, indent_str=indent_str)
     else:
         with open(path_or_fp, 'w', encoding='utf-8') as f:
-            f.write(text)
+            write_ker(obj, f.write, indent_str=indent_str)
 
 
 def load_json(path_or_fp):
     if hasattr(path_or_fp, 'read'):
         return json.load(path_or_fp)
-    with open(path_or_fp, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return json.loads(_read_text(path_or_fp))
 
 
 def json_to_ker(json_path, ker_path, indent_str="  "):
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = json.loads(_read_text(json_path))
     dump(data, ker_path, indent_str=indent_str)
 
 
 def ker_to_json(ker_path, json_path, indent=2):
-    root = Parser(open(ker_path, 'r', encoding='utf-8').read()).parse()
-    text = node_to_json(root)
+    text = Parser(_read_text(ker_path)).parse_to_plain()
     with open(json_path, 'w', encoding='utf-8') as f:
         json.dump(text, f, indent=indent, ensure_ascii=False)
@@ -1,17 +1,92 @@
 import os
+import tempfile
 import ker
+from ker.json_support import py_to_node, dumps_to_ker
+from ker.parser import Parser
 
 def main():
     # path relative to this file
     root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     example_path = os.path.join(root_dir, "examples", "example.ker")
 
-    with open(example_path, "r", encoding="utf-8") as f:
-        text = f.read()
-
-    data = ker.loads(text)
+    data = ker.load(example_path)
     print("JSON output:\n", data)
     print("\nRound-tripped .ker:\n", ker.dumps(data))
 
+    check_numbers()
+    check_escapes()
+    check_comments()
+    check_share_literals()
+    check_load_path()
+
+def check_numbers():
+    assert ker.loads("a = 1e5\nb = -2.5E-3\nc = 7") == {"a": 1e5, "b": -2.5e-3, "c": 7}
+    assert type(ker.loads("a = 1e5")["a"]) is float
+    # str(float) writes exponents, which have to read back unchanged
+    data = {"a": 1e-07, "b": 1e+20, "c": [1e-07, 1e+20]}
+    assert "1e-07" in ker.dumps(data) and "1e+20" in ker.dumps(data)
+    assert ker.loads(ker.dumps(data)) == data
+    print("\nnumbers: ok")
+
+def check_escapes():
+    # JSON escapes are decoded
+    assert ker.loads(r'a = "x\ny\t\"q\" \\ \/ \b\f\r"') == {"a": 'x\ny\t"q" \\ / \b\f\r'}
+    assert ker.loads(r'a = "\u263A \ud83d\ude00"') == {"a": "\u263a \U0001f600"}
+    # any other escape just drops the backslash
+    assert ker.loads(r'a = "\q\x"') == {"a": "qx"}
+    # ...also when mixed with JSON escapes, surrogate pairs included
+    assert ker.loads(r'a = "\ud83d\ude00 \q\n"') == {"a": "\U0001f600 q\n"}
+    # control characters survive a round trip
+    data = {"a": "".join(map(chr, range(32))) + '"\\\x7f\u263a'}
+    assert ker.loads(ker.dumps(data)) == data
+    print("\nstring escapes: ok")
+
+def check_comments():
+    # py_to_node trees take comments by appending
+    tree = py_to_node({"a": 1, "b": 2})
+    tree.children["a"].comments_before.append("hi")
+    assert dumps_to_ker(tree) == "# hi\na = 1\nb = 2"
+    print("\ncomments: ok")
+
+def check_share_literals():
+    text = "a = true\n# about b\nb = true\nc { d = true\ne = [null, null] }"
+    plain = Parser(text).parse()
+    tree = Parser(text).parse(share_literals=True)
+    assert dumps_to_ker(tree) == dumps_to_ker(plain)
+    # one leaf per value within the tree; a commented literal gets its own
+    a, b, c = tree.children["a"], tree.children["b"], tree.children["c"]
+    assert a is c.children["d"] and a is not b and b.comments_before == ["about b"]
+    assert c.children["e"].elements[0] is c.children["e"].elements[1]
+    # editing a shared leaf must not reach other trees
+    a.comments_before = ["leak"]
+    assert dumps_to_ker(Parser("z = true").parse(share_literals=True)) == "z = true"
+    print("\nshare_literals: ok")
+
+def check_load_path():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = os.path.join(tmp, "cache")
+        path = os.path.join(tmp, "conf.ker")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("a = 1\nb { c = [1, 2] }\n")
+
+        cold = ker.load_path(path, cache_dir=cache_dir)
+        warm = ker.load_path(path, cache_dir=cache_dir)
+        assert cold == warm == ker.load(path)
+        assert warm is not cold
+
+        # an edit invalidates the entry, which is replaced rather than added to
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("a = 2\n")
+        assert ker.load_path(path, cache_dir=cache_dir) == {"a": 2}
+        assert len(os.listdir(cache_dir)) == 1
+
+        # same size and same mtime: only the contents tell the versions apart
+        st = os.stat(path)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("a = 3\n")
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        assert ker.load_path(path, cache_dir=cache_dir) == {"a": 3}
+    print("\nload_path cache: ok")
+
 if __name__ == "__main__":
     main()